@@ -6,45 +6,59 @@ to a platform. It includes a task scheduler to automate these tasks.
 
 Features:
 - Text posting with content fetched from a specified API.
-- Image posting with images fetched and saved temporarily.
+- Image posting with images fetched and buffered in memory.
 - Secure credential handling using environment variables.
+- Session reuse across runs to skip repeated password logins.
 - Logging for debugging and tracking activity.
 - Task scheduling for periodic execution.
 
 Dependencies:
 - atproto
-- requests
+- aiohttp
+- orjson
 - schedule
 - logging
 
 Setup:
 1. Configure API credentials in environment variables: API_USERNAME, API_PASSWORD.
+   Optionally set SESSION_FILE to choose where the login session is cached.
 2. Replace placeholder URLs (<YOUR_API_URL>, <IMAGE_API_URL>) with actual endpoints.
-3. Install required Python packages: `pip install atproto requests schedule`.
+3. Install required Python packages: `pip install atproto aiohttp orjson schedule`.
 """
 
-from atproto import Client  # Import the Client class to interact with the API
-import requests  # Import the requests library to handle HTTP requests
+from atproto import Client, Session, SessionEvent  # Import the Client class to interact with the API
+import aiohttp  # Import aiohttp to handle asynchronous HTTP requests
+import asyncio  # Import asyncio to run the scheduler on an event loop
+import functools  # Import functools to bind arguments for blocking client calls
 import os  # Import os to access environment variables for secure credential handling
-import json  # Import json to parse JSON responses
+import orjson  # Import orjson to parse JSON responses quickly
 import schedule  # Import schedule to schedule tasks at regular intervals
-import time  # Import time to handle delays in the scheduler loop
 import logging  # Import logging for better debugging and tracking of events
-import tempfile  # Import tempfile for handling temporary files
+import io  # Import io to buffer downloaded images in memory
+import atexit  # Import atexit to flush queued log records on shutdown
+import queue  # Import queue to hand log records to the background listener
+import tempfile  # Import tempfile to write the session file atomically
+from logging.handlers import QueueHandler, QueueListener  # Import handlers for non-blocking logging
 
 # Configure the logging system
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("app.log"),  # Log to a file
-        logging.StreamHandler(),  # Also log to the console
-    ],
-)
+# Callers only enqueue records; a background listener thread does the file and console writes
+log_handlers = [
+    logging.FileHandler("app.log"),  # Log to a file
+    logging.StreamHandler(),  # Also log to the console
+]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[QueueHandler(log_queue)])
+log_listener = QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)  # Drain remaining records before the process exits
 
 # Fetch configuration from environment variables
 TEXT_API_URL = os.getenv("TEXT_API_URL", "https://example.com/api/text")
 IMAGE_API_URL = os.getenv("IMAGE_API_URL", "https://example.com/api/image")
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", 2 * 1024 * 1024))  # Largest image buffered in memory
 API_USERNAME = os.getenv("API_USERNAME")
 API_PASSWORD = os.getenv("API_PASSWORD")
 
@@ -52,26 +66,126 @@ if not (API_USERNAME and API_PASSWORD):
     logging.error("API_USERNAME and API_PASSWORD must be set as environment variables.")
     exit(1)
 
+# Location of the cached login session, kept per account
+SESSION_FILE = os.getenv(
+    "SESSION_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", f"bluesky_session_{API_USERNAME}"),
+)
+
+def save_session(event: SessionEvent, session: Session):
+    """
+    Persist the client session whenever it is created or refreshed.
+
+    Parameters:
+    - event (SessionEvent): The kind of session change reported by the client.
+    - session (Session): The current client session.
+    """
+    if event not in (SessionEvent.CREATE, SessionEvent.REFRESH):
+        return
+    try:
+        session_dir = os.path.dirname(SESSION_FILE)
+        os.makedirs(session_dir, exist_ok=True)
+        # Write a private (0600) temp file and swap it in, since concurrent posts can
+        # refresh the session from two threads at once
+        fd, temp_path = tempfile.mkstemp(dir=session_dir, prefix=".bluesky_session_")
+        try:
+            with open(fd, "w") as f:
+                # Store the configured login next to the session so email logins can be matched
+                f.write(f"{API_USERNAME}\n{session.export()}")
+            os.replace(temp_path, SESSION_FILE)
+        except OSError:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logging.warning(f"Failed to save session to {SESSION_FILE}: {e}")
+
+def login(client: Client):
+    """
+    Log in using the cached session if possible, falling back to username and password.
+
+    Parameters:
+    - client (Client): The API client to authenticate.
+    """
+    client.on_session_change(save_session)
+    try:
+        with open(SESSION_FILE) as f:
+            cached_login, _, session_string = f.read().partition("\n")
+        # Never resume a session that belongs to a different account
+        session = Session.decode(session_string)
+        if API_USERNAME.lower() not in (cached_login.lower(), session.handle.lower(), session.did):
+            raise ValueError(f"Cached session is for {session.handle}, not {API_USERNAME}")
+        client.login(session_string=session_string)
+        logging.info("Resumed cached session.")
+        return
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Cached session could not be used, logging in again: {e}")
+    client.login(API_USERNAME, API_PASSWORD)
+
 # Initialize the API client
 client = Client()
-client.login(API_USERNAME, API_PASSWORD)
+login(client)
 
-def textPost():
+# Shared HTTP session, reused across posts so connections are kept alive.
+# It is created lazily because aiohttp sessions must be bound to a running event loop.
+_session = None
+
+def get_session():
+    """
+    Return the shared HTTP session, creating it on first use.
+
+    Returns:
+    - aiohttp.ClientSession: Session with a 10 second total timeout per request and a small
+      keep-alive connection pool.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, limit_per_host=4),  # Only two APIs are polled
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _session
+
+async def close_session():
+    """
+    Close the shared HTTP session if it was opened.
+    """
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking client call in a worker thread so it does not stall the event loop.
+
+    Parameters:
+    - func (callable): The blocking function to call.
+    - *args, **kwargs: Arguments forwarded to the function.
+
+    Returns:
+    - The return value of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+async def textPost():
     """
     Fetch data from an API and post the response as text using the client.
     """
     try:
         # Fetch data from the API
-        response = fetch_data(TEXT_API_URL)
+        response = await fetch_data(TEXT_API_URL)
         
         # If the response is valid, post it as text
         if response:
-            post = client.post(text=response.get("text", "Default Text"))  # Use a default text if 'text' is not present in the response
+            post = await run_blocking(client.post, text=response.get("text", "Default Text"))  # Use a default text if 'text' is not present in the response
             logging.info(f"Text Posted: {post.uri}")  # Log the success and URI of the post
     except Exception as e:
         logging.error(f"Failed to post text: {e}")
 
-def fetch_data(url: str):
+async def fetch_data(url: str):
     """
     Fetch JSON data from the specified API endpoint.
 
@@ -82,50 +196,71 @@ def fetch_data(url: str):
     - dict: Parsed JSON data from the API response, or None if the request fails.
     """
     try:
-        # Make an HTTP GET request to the specified URL with a timeout of 10 seconds
-        res = requests.get(url, timeout=10)
-        
-        # Raise an exception if the response code indicates an error (4xx or 5xx)
-        res.raise_for_status()
-        
-        # Parse and return the JSON content of the response
-        return res.json()
-    except requests.RequestException as e:
+        # Make an HTTP GET request to the specified URL using the shared session
+        async with get_session().get(url) as res:
+            # Raise an exception if the response code indicates an error (4xx or 5xx)
+            res.raise_for_status()
+
+            # Parse and return the JSON content of the response
+            return orjson.loads(await res.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
         logging.error(f"HTTP Request failed for URL {url}: {e}")
         return None
 
-def imagePost():
+async def imagePost():
     """
-    Fetch an image from an API, save it temporarily, and post it with metadata.
+    Fetch an image from an API, buffer it in memory, and post it with metadata.
     """
     try:
-        # Fetch the image content from the API
-        res = requests.get(IMAGE_API_URL, stream=True)
-        res.raise_for_status()
-
-        # Use a temporary file to save the image
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_file:
-            temp_file.write(res.content)
-            temp_file_path = temp_file.name
-
-        # Open the saved image file in binary mode and post it using the client
-        with open(temp_file_path, "rb") as img:
-            post = client.send_image(
-                text="Daily Cat Picture!",  # Descriptive text for the post
-                image=img,  # Image content
-                image_alt="A cute cat picture",  # Alternative text for accessibility
-            )
+        # Fetch the image from the API and stream it into an in-memory buffer
+        image_buf = io.BytesIO()
+        async with get_session().get(IMAGE_API_URL) as res:
+            res.raise_for_status()
+            async for chunk in res.content.iter_chunked(65536):
+                image_buf.write(chunk)
+                # Stop early rather than buffering an unexpectedly large response
+                if image_buf.tell() > IMAGE_MAX_BYTES:
+                    raise ValueError(f"Image exceeds IMAGE_MAX_BYTES ({IMAGE_MAX_BYTES} bytes)")
+
+        # Post the buffered image bytes using the client
+        post = await run_blocking(
+            client.send_image,
+            text="Daily Cat Picture!",  # Descriptive text for the post
+            image=image_buf.getvalue(),  # Image content
+            image_alt="A cute cat picture",  # Alternative text for accessibility
+        )
 
         logging.info(f"Image Posted: {post.uri}")
     except Exception as e:
         logging.error(f"Failed to post image: {e}")
 
+async def scheduler():
+    """
+    Run scheduled jobs on the event loop until no jobs remain.
+
+    Instead of polling every second, the loop sleeps until the next job is due, so the
+    process stays idle between posts. The shared HTTP session is closed on exit.
+    """
+    try:
+        while True:
+            delay = schedule.idle_seconds()
+            if delay is None:
+                break  # No jobs are scheduled
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Run every job that is due concurrently, so overlapping posts share the wait
+            due_jobs = sorted(job for job in schedule.jobs if job.should_run)
+            await asyncio.gather(*(job.run() for job in due_jobs))
+    finally:
+        await close_session()
+
 def run_scheduler():
     """
     Configure and run the task scheduler.
 
-    This function schedules tasks to run at regular intervals and enters an infinite loop
-    to keep the scheduler running.
+    This function schedules tasks to run at regular intervals and runs the asyncio
+    scheduler loop to keep them running.
     """
     # Schedule the textPost function to run every minute
     schedule.every(1).minutes.do(textPost)
@@ -135,10 +270,8 @@ def run_scheduler():
     
     logging.info("Scheduler is running. Press Ctrl+C to stop.")
 
-    # Infinite loop to keep the scheduler running
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # Run the scheduler on an event loop until interrupted
+    asyncio.run(scheduler())
 
 # Entry point of the script
 if __name__ == "__main__":
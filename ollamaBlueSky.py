@@ -4,15 +4,26 @@ Ollama Social Bot Wireframe
 A customizable template for creating AI-powered social media bots using LlamaIndex and Bluesky.
 """
 
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, Settings, StorageContext, PromptTemplate, load_index_from_storage
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.llms.ollama import Ollama
-from atproto import Client, models
+# LlamaIndex, HuggingFace and Ollama imports are deferred to the methods that
+# use them, so the torch/transformers stack only loads when posts are generated
+from atproto import Client, Session, SessionEvent, models
+from collections import OrderedDict
+import functools
+import hashlib
 import os
 import re
 import random
+import tempfile
 import datetime
 
+# Patterns used on every generated post, compiled once at import
+_MD_RE = re.compile(r'\*\*|"')
+_TAG_RE = re.compile(r'(?:^|\s)(#\w+)')
+_WS_RE = re.compile(r'\s+')
+
+# Dedicated generator for prompt component draws, seeded from os.urandom
+_rng = random.Random()
+
 # --------------------------
 # Configuration
 # --------------------------
@@ -20,9 +31,14 @@ class Config:
     # Social Media Configuration
     SOCIAL_MEDIA_HANDLE = os.getenv('BLUESKY_HANDLE', 'your-handle.bsky.social')
     SOCIAL_MEDIA_APP_PASSWORD = os.getenv('BLUESKY_APP_PASSWORD', 'your-app-password')
+    SESSION_FILE = os.getenv(
+        'BLUESKY_SESSION_FILE',
+        os.path.join(os.path.expanduser('~'), '.cache', f'bluesky_session_{SOCIAL_MEDIA_HANDLE}')
+    )
     
     # Content Generation Parameters
     MAX_POST_LENGTH = 300
+    RETRIEVAL_CACHE_SIZE = 256  # Retrieved context kept per prompt
     HASHTAG_POOLS = [
         "#AI #Tech #Innovation",
         "#OpenSource #Community #Dev"
@@ -31,9 +47,15 @@ class Config:
     # Path Configuration
     DATA_DIR = "./data"
     STORAGE_DIR = "./storage"
+    VECTOR_STORE_FILE = "default__vector_store.json"  # LlamaIndex's default name; holds a binary FAISS index
+    EMBEDDING_MARKER_FILE = "embedding_model.txt"  # Embedding model the stored vectors were built with
     
     # Model Configuration
     EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+    EMBEDDING_ONNX_DIR = "./models/bge-base-en-v1.5-onnx"
+    EMBEDDING_QUANTIZATION = os.getenv('EMBEDDING_QUANTIZATION', 'avx512_vnni')  # avx512_vnni, avx512, avx2 or arm64
+    EMBEDDING_ONNX_SUFFIX = f"int8_{EMBEDDING_QUANTIZATION}"  # Passed to the export so the file name is predictable
+    EMBEDDING_ONNX_FILE = f"onnx/model_{EMBEDDING_ONNX_SUFFIX}.onnx"
     LLM_MODEL = "llama3.2:latest"
 
 # --------------------------
@@ -41,7 +63,11 @@ class Config:
 # --------------------------
 class ContentGenerator:
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def create_prompt_template():
+        # The template text is fixed, so build it once and reuse it
+        from llama_index.core import PromptTemplate
+        
         return PromptTemplate(
             template="""\
 Create a social media post about {topic} with these guidelines:
@@ -73,31 +99,109 @@ class SocialBot:
     def __init__(self):
         self._setup_models()
         self.index = self._initialize_index()
+        self.query_engine = self.index.as_query_engine()
+        self._retrieval_cache = OrderedDict()
         
     def _setup_models(self):
-        Settings.embed_model = HuggingFaceEmbedding(model_name=Config.EMBEDDING_MODEL)
+        from llama_index.core import Settings
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+        from llama_index.llms.ollama import Ollama
+        
+        # Run the embedding model as int8 ONNX on CPU rather than FP32 PyTorch
+        Settings.embed_model = HuggingFaceEmbedding(
+            model_name=self._export_quantized_embedding_model(),
+            backend="onnx",
+            model_kwargs={"file_name": Config.EMBEDDING_ONNX_FILE}
+        )
         Settings.llm = Ollama(model=Config.LLM_MODEL, request_timeout=360.0)
         
+    def _export_quantized_embedding_model(self) -> str:
+        # Export and quantize once, later runs load the saved ONNX model directly
+        if not os.path.exists(os.path.join(Config.EMBEDDING_ONNX_DIR, Config.EMBEDDING_ONNX_FILE)):
+            from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+            
+            model = SentenceTransformer(Config.EMBEDDING_MODEL, backend="onnx")
+            model.save_pretrained(Config.EMBEDDING_ONNX_DIR)
+            export_dynamic_quantized_onnx_model(
+                model,
+                Config.EMBEDDING_QUANTIZATION,
+                Config.EMBEDDING_ONNX_DIR,
+                file_suffix=Config.EMBEDDING_ONNX_SUFFIX
+            )
+        return Config.EMBEDDING_ONNX_DIR
+        
     def _initialize_index(self):
-        if os.path.exists(Config.STORAGE_DIR):
-            return load_index_from_storage(StorageContext.from_defaults(persist_dir=Config.STORAGE_DIR))
+        import faiss
+        from llama_index.core import Settings, VectorStoreIndex, SimpleDirectoryReader, StorageContext, load_index_from_storage
+        from llama_index.vector_stores.faiss import FaissVectorStore
+        
+        vector_store_path = os.path.join(Config.STORAGE_DIR, Config.VECTOR_STORE_FILE)
+        marker_path = os.path.join(Config.STORAGE_DIR, Config.EMBEDDING_MARKER_FILE)
+        embedding_id = f"{Config.EMBEDDING_MODEL}/{Config.EMBEDDING_ONNX_FILE}"
+        
+        if os.path.exists(vector_store_path) and self._read_marker(marker_path) != embedding_id:
+            # Vectors from another model or quantization would not match new query embeddings
+            print(f"Rebuilding index storage for embedding model {embedding_id}")
+        elif os.path.exists(vector_store_path):
+            try:
+                # Memory-map the flat index codes so only the pages a search touches are read
+                faiss_index = faiss.read_index(vector_store_path, faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+                storage_context = StorageContext.from_defaults(
+                    vector_store=FaissVectorStore(faiss_index=faiss_index),
+                    persist_dir=Config.STORAGE_DIR
+                )
+                return load_index_from_storage(storage_context)
+            except RuntimeError as e:
+                # Storage written by the JSON vector store, rebuild it as a FAISS index
+                print(f"Rebuilding index storage: {str(e)}")
             
         documents = SimpleDirectoryReader(input_dir=Config.DATA_DIR).load_data()
-        index = VectorStoreIndex.from_documents(documents)
+        # Size the index from the embedding model itself so the two cannot drift apart
+        embedding_dim = len(Settings.embed_model.get_text_embedding("x"))
+        storage_context = StorageContext.from_defaults(
+            vector_store=FaissVectorStore(faiss_index=faiss.IndexFlatL2(embedding_dim))
+        )
+        index = VectorStoreIndex.from_documents(documents, storage_context=storage_context)
         index.storage_context.persist(persist_dir=Config.STORAGE_DIR)
+        with open(marker_path, 'w') as f:
+            f.write(embedding_id)
         return index
 
+    def _read_marker(self, marker_path: str):
+        try:
+            with open(marker_path) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
     def generate_post(self, query: str) -> str:
-        response = self.index.as_query_engine().query(query)
+        from llama_index.core import QueryBundle
+        
+        query_bundle = QueryBundle(query)
+        # Retrieval is cached, the LLM still writes a fresh post every time
+        response = self.query_engine.synthesize(query_bundle, self._retrieve(query_bundle))
         return self._process_response(response)
 
+    def _retrieve(self, query_bundle):
+        # Identical prompts skip the query embedding and vector search
+        key = hashlib.sha1(query_bundle.query_str.encode('utf-8')).hexdigest()
+        if key in self._retrieval_cache:
+            self._retrieval_cache.move_to_end(key)
+            return self._retrieval_cache[key]
+            
+        nodes = self.query_engine.retrieve(query_bundle)
+        self._retrieval_cache[key] = nodes
+        if len(self._retrieval_cache) > Config.RETRIEVAL_CACHE_SIZE:
+            self._retrieval_cache.popitem(last=False)  # Evict the least recently used prompt
+        return nodes
+
     def _process_response(self, response):
-        processed_text = ' '.join(str(response.response).strip().split())
+        processed_text = _WS_RE.sub(' ', str(response.response)).strip()
         return self._sanitize_content(processed_text)
 
     def _sanitize_content(self, text: str) -> str:
         # Content cleaning and validation logic
-        text = re.sub(r'\*\*|"', '', text)  # Remove markdown
+        text = _MD_RE.sub('', text)  # Remove markdown
         return self._truncate_content(text)
 
     def _truncate_content(self, text: str) -> str:
@@ -111,38 +215,78 @@ class SocialBot:
 class BlueskyClient:
     def __init__(self):
         self.client = Client()
+        self.client.on_session_change(self._save_session)
         
     def authenticate(self):
+        # Reuse the cached session when possible to skip the password login
+        try:
+            with open(Config.SESSION_FILE) as f:
+                cached_login, _, session_string = f.read().partition('\n')
+            # Never resume a session that belongs to a different account
+            session = Session.decode(session_string)
+            login = Config.SOCIAL_MEDIA_HANDLE.lower()
+            if login not in (cached_login.lower(), session.handle.lower(), session.did):
+                raise ValueError(f"Cached session is for {session.handle}, not {Config.SOCIAL_MEDIA_HANDLE}")
+            self.client.login(session_string=session_string)
+            return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Cached session could not be used, logging in again: {str(e)}")
+        
         self.client.login(
             Config.SOCIAL_MEDIA_HANDLE,
             Config.SOCIAL_MEDIA_APP_PASSWORD
         )
         
+    def _save_session(self, event: SessionEvent, session: Session):
+        if event not in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            return
+        try:
+            session_dir = os.path.dirname(Config.SESSION_FILE)
+            os.makedirs(session_dir, exist_ok=True)
+            # Write a private (0600) temp file and swap it in, so readers never see a partial session
+            fd, temp_path = tempfile.mkstemp(dir=session_dir, prefix='.bluesky_session_')
+            try:
+                with open(fd, 'w') as f:
+                    # Store the configured login next to the session so email logins can be matched
+                    f.write(f"{Config.SOCIAL_MEDIA_HANDLE}\n{session.export()}")
+                os.replace(temp_path, Config.SESSION_FILE)
+            except OSError:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print(f"Failed to save session: {str(e)}")
+        
     def create_post(self, text: str):
         facets = self._create_hashtag_facets(text)
         return self.client.send_post(text=text, facets=facets)
         
     def _create_hashtag_facets(self, text: str):
-        class UnicodeString:
-            def __init__(self, text: str):
-                self.text = text
-                self.utf8 = text.encode('utf-8')
-            
-            def byte_length(self, char_count: int) -> int:
-                return len(self.text[:char_count].encode('utf-8'))
-        
-        text_obj = UnicodeString(text)
         facets = []
+        # In ASCII text every character is one UTF-8 byte, so offsets need no encoding
+        is_ascii = text.isascii()
+        # Otherwise matches arrive in order, so carry the UTF-8 byte offset forward
+        # instead of re-encoding the whole prefix for every hashtag
+        char_pos = 0
+        byte_pos = 0
         
-        for match in re.finditer(r'(?:^|\s)(#\w+)', text):
+        for match in _TAG_RE.finditer(text):
             hashtag = match.group(1)
             start_char = match.start(1)
             end_char = match.end(1)
             
+            if is_ascii:
+                byte_start, byte_end = start_char, end_char
+            else:
+                byte_start = byte_pos + len(text[char_pos:start_char].encode('utf-8'))
+                byte_end = byte_start + len(hashtag.encode('utf-8'))
+                char_pos, byte_pos = end_char, byte_end
+            
             facets.append({
                 "index": {
-                    "byteStart": text_obj.byte_length(start_char),
-                    "byteEnd": text_obj.byte_length(end_char)
+                    "byteStart": byte_start,
+                    "byteEnd": byte_end
                 },
                 "features": [{
                     "$type": "app.bsky.richtext.facet#tag",
@@ -157,24 +301,25 @@ class BlueskyClient:
 # --------------------------
 if __name__ == "__main__":
     # Initialize components
-    bot = SocialBot()
     bluesky = BlueskyClient()
     components = ContentGenerator.get_dynamic_components()
     
-    # Generate query with dynamic components
-    prompt_template = ContentGenerator.create_prompt_template().format(
-        topic=random.choice(components["topics"]),
-        tone=random.choice(components["tones"]),
-        hashtags=random.choice(Config.HASHTAG_POOLS),
-        hashtag_count=random.randint(1, 3),
-        max_length=Config.MAX_POST_LENGTH,
-        examples="\n".join(random.sample(components["examples"], 2))
-    )
-    
-    # Generate and post content
     try:
+        bluesky.authenticate()  # Fail fast on bad credentials before loading LlamaIndex or any models
+        
+        # Generate query with dynamic components
+        prompt_template = ContentGenerator.create_prompt_template().format(
+            topic=_rng.choice(components["topics"]),
+            tone=_rng.choice(components["tones"]),
+            hashtags=_rng.choice(Config.HASHTAG_POOLS),
+            hashtag_count=_rng.randint(1, 3),
+            max_length=Config.MAX_POST_LENGTH,
+            examples="\n".join(_rng.sample(components["examples"], 2))
+        )
+        
+        # Generate and post content
+        bot = SocialBot()
         post_content = bot.generate_post(prompt_template)
-        bluesky.authenticate()
         bluesky.create_post(post_content)
         print(f"Successfully posted: {post_content}")
     except Exception as e:
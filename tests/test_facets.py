@@ -0,0 +1,48 @@
+import pytest
+
+from ollamaBlueSky import BlueskyClient
+
+
+def expected_facets(text, tags):
+    """Build facets by encoding each full prefix, the way byte offsets are defined."""
+    facets = []
+    start = 0
+    for tag in tags:
+        start = text.index(tag, start)
+        end = start + len(tag)
+        facets.append((len(text[:start].encode("utf-8")), len(text[:end].encode("utf-8")), tag[1:].lower()))
+        start = end
+    return facets
+
+
+def actual_facets(text):
+    return [
+        (facet["index"]["byteStart"], facet["index"]["byteEnd"], facet["features"][0]["tag"])
+        for facet in BlueskyClient()._create_hashtag_facets(text)
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, tags",
+    [
+        ("#AI is here #Tech #Innovation", ["#AI", "#Tech", "#Innovation"]),
+        ("Café déjà vu #OpenSource #Dev", ["#OpenSource", "#Dev"]),
+        ("🤖 #EthicalAI 🚀\n#Über #x", ["#EthicalAI", "#Über", "#x"]),
+        ("日本語 #タグ and #ascii", ["#タグ", "#ascii"]),
+    ],
+    ids=["ascii", "multibyte-prefix", "emoji-adjacent", "multibyte-tag"],
+)
+def test_hashtag_facet_byte_offsets(text, tags):
+    assert actual_facets(text) == expected_facets(text, tags)
+
+
+def test_hashtag_facet_offsets_slice_utf8_bytes():
+    text = "🚀 launch day #Launch"
+    utf8 = text.encode("utf-8")
+    (start, end, tag), = actual_facets(text)
+    assert utf8[start:end].decode("utf-8") == "#Launch"
+    assert tag == "launch"
+
+
+def test_no_hashtags():
+    assert actual_facets("no tags here, just a#mid-word hash") == []
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from ollamaBlueSky import Config, SocialBot
+
+
+class StubQueryEngine:
+    def __init__(self):
+        self.calls = []
+
+    def retrieve(self, query_bundle):
+        self.calls.append(query_bundle.query_str)
+        return [f"nodes for {query_bundle.query_str}"]
+
+
+def make_bot():
+    # Skip __init__ so no models or index are loaded
+    bot = SocialBot.__new__(SocialBot)
+    bot.query_engine = StubQueryEngine()
+    bot._retrieval_cache = OrderedDict()
+    return bot
+
+
+def retrieve(bot, query):
+    return bot._retrieve(SimpleNamespace(query_str=query))
+
+
+def test_retrieve_once_per_distinct_prompt():
+    bot = make_bot()
+    assert retrieve(bot, "a") == ["nodes for a"]
+    assert retrieve(bot, "b") == ["nodes for b"]
+    assert retrieve(bot, "a") == ["nodes for a"]
+    assert bot.query_engine.calls == ["a", "b"]
+
+
+def test_evicts_least_recently_used_prompt(monkeypatch):
+    monkeypatch.setattr(Config, "RETRIEVAL_CACHE_SIZE", 2)
+    bot = make_bot()
+    retrieve(bot, "a")
+    retrieve(bot, "b")
+    retrieve(bot, "a")  # Refreshes "a", leaving "b" as the oldest entry
+    retrieve(bot, "c")  # Evicts "b"
+    assert len(bot._retrieval_cache) == 2
+
+    retrieve(bot, "a")
+    retrieve(bot, "b")
+    assert bot.query_engine.calls == ["a", "b", "c", "b"]